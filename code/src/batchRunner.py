@@ -0,0 +1,462 @@
+"""
+Streaming Command-Line Batch Runner for Headless Large-File Transaction Processing
+
+Records flow parse -> NER -> categorization -> screening/scoring/output through
+bounded queues, so memory stays flat on large inputs and a slow stage applies
+backpressure to the ones before it. Progress is checkpointed after every output
+batch and a crashed run resumes from the last checkpoint. An input file that
+cannot be parsed is logged and skipped; the run carries on with the next file.
+
+Usage:
+    python batchRunner.py data/transactions.csv data/transactions.txt -o out.jsonl
+    python batchRunner.py "uploads/*.txt" -o out.csv --format csv --categorize
+"""
+
+import os
+import io
+import csv
+import sys
+import glob
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from processStructured import process_transaction_dataframe, build_transaction_record
+from processUnstructured import iter_unstructured_file, parse_unstructured_data, build_unstructured_record
+from financial_entity_categorizer import FinancialEntityCategorizer
+from categorizationPipeline import DEFAULT_CACHE_SIZE, CategorizationPipeline
+from sanctionsScreening import SanctionsScreener
+from riskScoring import score_transactions
+from fastEntityTyper import fast_path_stats
+
+# --- Configure Logging ---
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# --- Constants ---
+SUPPORTED_EXTENSIONS = ('.csv', '.txt')
+OUTPUT_FORMATS = ('jsonl', 'csv')
+
+CSV_COLUMNS = [
+    "Source File", "Transaction ID", "Date", "Amount", "Transaction Type",
+    "Sender Name", "Receiver Name", "Risk Score", "Confidence Score", "Sanctions Hits"
+]
+
+# Queue item marking the end of one input file / of the whole stream
+FILE_END = "file_end"
+STREAM_END = None
+
+# --- Helper Functions ---
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expands input globs into a sorted, de-duplicated list of supported files."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or ([pattern] if os.path.isfile(pattern) else [])
+        if not matches:
+            logger.warning(f"No files match input: {pattern}")
+        for path in matches:
+            if not path.endswith(SUPPORTED_EXTENSIONS):
+                logger.warning(f"Skipping unsupported file type: {path}")
+            elif path not in paths:
+                paths.append(path)
+    return paths
+
+
+def iter_parsed_records(path: str, skip: int = 0, chunk_size: int = 1000) -> Iterator[Tuple[int, Tuple]]:
+    """
+    Lazily parses an input file into (record index, parse result) pairs.
+
+    Args:
+        path (str): A .csv or .txt transactions file
+        skip (int): Number of leading records to skip (already processed)
+        chunk_size (int): Rows read per pandas chunk for .csv input
+
+    Yields:
+        Tuple[int, Tuple]: ('csv', row) or ('txt', (raw text, parsed fields))
+    """
+    if path.endswith('.csv'):
+        index = 0
+        for chunk in pd.read_csv(path, chunksize=chunk_size):
+            if index + len(chunk) <= skip:
+                index += len(chunk)
+                continue
+            for _, row in process_transaction_dataframe(chunk).iterrows():
+                if index >= skip:
+                    yield index, ('csv', row)
+                index += 1
+    else:
+        for index, data in enumerate(iter_unstructured_file(path)):
+            if index >= skip:
+                yield index, ('txt', (data, parse_unstructured_data(data)))
+
+
+def format_csv_row(record: Dict) -> List:
+    """Flattens a scored record into CSV_COLUMNS."""
+    return [
+        record.get("Source File"),
+        record.get("Transaction ID"),
+        record.get("Date"),
+        record.get("Amount"),
+        record.get("Transaction Type"),
+        (record.get("Sender") or {}).get("Name"),
+        (record.get("Receiver") or {}).get("Name"),
+        record.get("Risk Score"),
+        record.get("Confidence Score"),
+        "; ".join(f"{hit['Matched Name']} ({hit['Score']})" for hit in record.get("Sanctions Hits") or [])
+    ]
+
+
+class Checkpoint:
+    def __init__(self, path: Optional[str], output_path: str):
+        """
+        Tracks per-file progress and the output byte offset it corresponds to.
+
+        Args:
+            path (Optional[str]): Checkpoint file, or None to disable checkpointing
+            output_path (str): Output file the checkpoint belongs to
+        """
+        self.path = path
+        self.state = {"output": os.path.abspath(output_path), "output_offset": 0, "files": {}}
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (IOError, ValueError) as e:
+                logger.error(f"Ignoring unreadable checkpoint {path}: {str(e)}")
+                return
+            if state.get("output") != self.state["output"]:
+                logger.warning(f"Ignoring checkpoint {path}: it belongs to {state.get('output')}")
+                return
+            self.state = state
+            logger.info(f"Resuming from checkpoint {path} at output offset {state['output_offset']}")
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.state["files"])
+
+    def records_done(self, input_path: str) -> int:
+        return self.state["files"].get(os.path.abspath(input_path), {}).get("records", 0)
+
+    def file_done(self, input_path: str) -> bool:
+        return self.state["files"].get(os.path.abspath(input_path), {}).get("done", False)
+
+    def update(self, input_path: str, records: int, done: bool = False) -> None:
+        entry = self.state["files"].setdefault(os.path.abspath(input_path), {"records": 0, "done": False})
+        entry["records"] = max(entry["records"], records)
+        entry["done"] = entry["done"] or done
+
+    def save(self, output_offset: int) -> None:
+        """Atomically persists the checkpoint; called only after the output is flushed."""
+        self.state["output_offset"] = output_offset
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BatchRunner:
+    def __init__(self, input_paths: List[str], output_path: str, output_format: str = 'jsonl',
+                 checkpoint_path: Optional[str] = None, queue_size: int = 64, batch_size: int = 100,
+                 chunk_size: int = 1000, categorize: bool = False, lookup_workers: int = 4,
+                 category_cache_size: int = DEFAULT_CACHE_SIZE,
+                 categorizer: Optional[FinancialEntityCategorizer] = None,
+                 screener: Optional[SanctionsScreener] = None):
+        """
+        Streams transaction files through the processing stages into one output file.
+
+        Args:
+            input_paths (List[str]): Expanded .csv/.txt input files
+            output_path (str): Destination file
+            output_format (str): 'jsonl' or 'csv'
+            checkpoint_path (Optional[str]): Checkpoint file used for resuming, None to disable
+            queue_size (int): Capacity of each inter-stage queue
+            batch_size (int): Records screened, scored and written per output batch
+            chunk_size (int): Rows read per pandas chunk for .csv input
+            categorize (bool): Whether to run the Wikipedia categorization stage
+            lookup_workers (int): Concurrent Wikipedia lookups in the categorization stage
+            category_cache_size (int): Entities whose categories are cached between records
+            categorizer (Optional[FinancialEntityCategorizer]): Categorizer override
+            screener (Optional[SanctionsScreener]): Sanctions screener override
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        self.input_paths = input_paths
+        self.output_path = output_path
+        self.output_format = output_format
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.categorizer = categorizer or (FinancialEntityCategorizer() if categorize else None)
+        self.pipeline = (
+            CategorizationPipeline(self.categorizer, queue_size=queue_size, lookup_workers=lookup_workers,
+                                   cache_size=category_cache_size)
+            if self.categorizer else None
+        )
+        self.screener = screener or SanctionsScreener()
+        self.checkpoint = Checkpoint(checkpoint_path, output_path)
+
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+        self.records_written = 0
+
+    # --- Queue plumbing ---
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Blocks until q has room (backpressure) unless the run is being aborted."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return STREAM_END
+
+    def _iter_queue(self, q: queue.Queue) -> Iterator:
+        while True:
+            item = self._get(q)
+            if item is STREAM_END:
+                return
+            yield item
+
+    def _run_stage(self, name: str, in_q: Optional[queue.Queue], out_q: queue.Queue, work) -> None:
+        """Runs one stage thread, forwarding file/stream markers; source failures abort the run."""
+        try:
+            if in_q is None:
+                work(out_q)
+            else:
+                while True:
+                    item = self._get(in_q)
+                    if item is STREAM_END:
+                        break
+                    if item[0] == FILE_END:
+                        self._put(out_q, item)
+                        continue
+                    path, index, payload = item
+                    try:
+                        result = None if payload is None else work(payload)
+                    except Exception as e:
+                        # A bad record is dropped (but still checkpointed) rather than failing the run
+                        logger.error(f"{name} stage failed on {path} record {index}: {str(e)}")
+                        result = None
+                    self._put(out_q, (path, index, result))
+        except BaseException as e:
+            logger.error(f"{name} stage failed: {str(e)}")
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            self._put(out_q, STREAM_END)
+
+    # --- Stages ---
+
+    def _parse_stage(self, out_q: queue.Queue) -> None:
+        for path in self.input_paths:
+            if self.checkpoint.file_done(path):
+                logger.info(f"Skipping completed file: {path}")
+                continue
+            skip = self.checkpoint.records_done(path)
+            count = skip
+            try:
+                for index, parsed in iter_parsed_records(path, skip, self.chunk_size):
+                    if not self._put(out_q, (path, index, parsed)):
+                        return
+                    count = index + 1
+            except (ValueError, KeyError) as e:
+                # Malformed or non-transaction files (bad encoding, missing columns) are skipped like
+                # process_structured_transactions does; I/O errors still abort so the run can resume
+                logger.error(f"Skipping {path} after {count} records: {str(e)}")
+            self._put(out_q, (FILE_END, path, count))
+
+    def _ner_stage(self, parsed: Tuple) -> Dict:
+        kind, value = parsed
+        if kind == 'csv':
+            return build_transaction_record(value)
+        data, parsed_data = value
+        return build_unstructured_record(data, parsed_data)
+
+    def _categorize_stage(self, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        # Lookups for a record's organizations run concurrently while NER works on the next records
+        records = self.pipeline.stream(
+            self._iter_queue(in_q), get_record=lambda item: None if item[0] == FILE_END else item[2]
+        )
+        for item in records:
+            if not self._put(out_q, item):
+                return
+
+    # --- Output ---
+
+    def _open_output(self):
+        if self.checkpoint.resumed and os.path.exists(self.output_path):
+            f = open(self.output_path, 'r+b')
+            f.truncate(self.checkpoint.state["output_offset"])
+            f.seek(0, io.SEEK_END)
+            return f
+        self.checkpoint.state["files"] = {}
+        return open(self.output_path, 'wb')
+
+    def _serialize(self, record: Dict, write_header: bool) -> bytes:
+        if self.output_format == 'jsonl':
+            # allow_nan=False: bare NaN is not JSON and would break strict JSONL readers
+            return (json.dumps(record, default=str, allow_nan=False) + '\n').encode('utf-8')
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if write_header:
+            writer.writerow(CSV_COLUMNS)
+        writer.writerow(format_csv_row(record))
+        return buffer.getvalue().encode('utf-8')
+
+    def _flush_batch(self, out_file, batch: List[Tuple[str, int, Dict]]) -> None:
+        """Screens, scores and writes a batch, then checkpoints past it."""
+        written = 0
+        records = [record for _, _, record in batch if record is not None]
+        if records:
+            categories = {}
+            for record in records:
+                categories.update(record.get("Entity Categories") or {})
+            score_transactions(self.screener.screen_transactions(records), categories)
+
+        for path, index, record in batch:
+            if record is not None:
+                record["Source File"] = path
+                out_file.write(self._serialize(record, out_file.tell() == 0))
+                written += 1
+            self.checkpoint.update(path, index + 1)
+
+        out_file.flush()
+        os.fsync(out_file.fileno())
+        self.checkpoint.save(out_file.tell())
+        self.records_written += written
+        batch.clear()
+
+    def run(self) -> int:
+        """
+        Runs the pipeline to completion.
+
+        Returns:
+            int: Number of records written during this run
+
+        Raises:
+            Exception: The first error raised by any stage
+        """
+        parse_q = queue.Queue(maxsize=self.queue_size)
+        ner_q = queue.Queue(maxsize=self.queue_size)
+        stages = [
+            ("parse", None, parse_q, self._parse_stage),
+            ("ner", parse_q, ner_q, self._ner_stage),
+        ]
+        final_q = ner_q
+        if self.pipeline:
+            final_q = queue.Queue(maxsize=self.queue_size)
+            stages.append(("categorize", None, final_q, lambda out_q: self._categorize_stage(ner_q, out_q)))
+
+        threads = [
+            threading.Thread(target=self._run_stage, args=stage, name=f"batch-{stage[0]}", daemon=True)
+            for stage in stages
+        ]
+        for thread in threads:
+            thread.start()
+
+        start = time.monotonic()
+        batch: List[Tuple[str, int, Dict]] = []
+        with self._open_output() as out_file:
+            try:
+                while True:
+                    item = self._get(final_q)
+                    if item is STREAM_END:
+                        break
+                    if item[0] == FILE_END:
+                        _, path, count = item
+                        self._flush_batch(out_file, batch)
+                        self.checkpoint.update(path, count, done=True)
+                        self.checkpoint.save(out_file.tell())
+                        logger.info(f"Finished {path} ({count} records)")
+                        continue
+
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        self._flush_batch(out_file, batch)
+                        elapsed = time.monotonic() - start
+                        logger.info(f"Processed {self.records_written} records "
+                                    f"({self.records_written / max(elapsed, 1e-9):.1f} records/s)")
+            finally:
+                self._stop.set()
+                for thread in threads:
+                    thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+        elapsed = time.monotonic() - start
+        logger.info(f"Wrote {self.records_written} records to {self.output_path} in {elapsed:.2f}s "
+                    f"({self.records_written / max(elapsed, 1e-9):.1f} records/s)")
+        logger.info(f"Entity typing: {fast_path_stats.report()}")
+        self.checkpoint.clear()
+        return self.records_written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Process transaction files headlessly in streaming batches.")
+    parser.add_argument("inputs", nargs='+', help="Input .csv/.txt files or glob patterns")
+    parser.add_argument("-o", "--output", required=True, help="Output file path")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default='jsonl', help="Output format")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.ckpt)")
+    parser.add_argument("--no-checkpoint", action='store_true', help="Disable checkpointing and resuming")
+    parser.add_argument("--queue-size", type=int, default=64, help="Capacity of each inter-stage queue")
+    parser.add_argument("--batch-size", type=int, default=100, help="Records written per checkpointed batch")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows read per chunk from .csv input")
+    parser.add_argument("--categorize", action='store_true', help="Categorize organizations via Wikipedia")
+    parser.add_argument("--lookup-workers", type=int, default=4, help="Concurrent lookups when categorizing")
+    parser.add_argument("--category-cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="Entities whose categories are cached when categorizing")
+    parser.add_argument("--sanctions-list", help="Sanctions list (.csv/.xml) to screen against")
+    args = parser.parse_args(argv)
+
+    input_paths = expand_inputs(args.inputs)
+    if not input_paths:
+        logger.error("No input files to process")
+        return 1
+
+    checkpoint_path = None if args.no_checkpoint else (args.checkpoint or f"{args.output}.ckpt")
+    screener = SanctionsScreener(args.sanctions_list) if args.sanctions_list else None
+
+    runner = BatchRunner(
+        input_paths, args.output, output_format=args.format, checkpoint_path=checkpoint_path,
+        queue_size=args.queue_size, batch_size=args.batch_size, chunk_size=args.chunk_size,
+        categorize=args.categorize, lookup_workers=args.lookup_workers,
+        category_cache_size=args.category_cache_size, screener=screener
+    )
+    try:
+        runner.run()
+    except Exception as e:
+        logger.error(f"Batch run failed: {str(e)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Pipelined Wikipedia Categorization Overlapping the NER Stage
+
+spaCy NER is CPU-bound and Wikipedia lookups are network-bound, so running them
+one after the other wastes the time spent waiting on the network. Here each
+record coming out of NER has its newly seen organizations pushed into a bounded
+queue, and a pool of lookup workers categorizes them while NER moves on to the
+next record. A full queue stops the pipeline pulling further records from NER
+(backpressure) instead of buffering unbounded work. Records come out in input
+order once all of their organizations are categorized.
+"""
+
+import time
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from financial_entity_categorizer import FinancialEntityCategorizer
+
+logger = logging.getLogger(__name__)
+
+# --- Constants ---
+CATEGORIZED_ENTITY_TYPES = {"Organization", "Bank"}
+
+# Categorized entities kept between records; evicted names are simply looked up again
+DEFAULT_CACHE_SIZE = 10000
+
+# Queue item ending the lookup workers / the pending-record stream
+_END = object()
+
+
+class CategorizationPipeline:
+    def __init__(self, categorizer: Optional[FinancialEntityCategorizer] = None,
+                 queue_size: int = 32, lookup_workers: int = 4, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Categorizes the organizations of a record stream with concurrent lookups.
+
+        Args:
+            categorizer (Optional[FinancialEntityCategorizer]): Anything with get_matching_categories
+            queue_size (int): Capacity of the entity queue and of the pending-record buffer
+            lookup_workers (int): Number of concurrent categorization lookups
+            cache_size (int): Most recently used entities whose categories are kept; names that
+                records still in the pipeline need are held on top of this until those records leave
+        """
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+
+        self.categorizer = categorizer or FinancialEntityCategorizer()
+        self.queue_size = queue_size
+        self.lookup_workers = lookup_workers
+        self.cache_size = cache_size
+
+        # LRU of results, kept across streams
+        self._resolved = threading.Condition()
+        self._categories: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.stats: Dict[str, float] = {"records": 0, "entities": 0, "lookup_seconds": 0.0}
+
+    @staticmethod
+    def organization_names(record: Dict) -> List[str]:
+        """Returns the distinct organization/bank names found in a record."""
+        names = []
+        for entity in record.get("Proper Noun Entities") or []:
+            name = entity.get("Entity Name")
+            if name and entity.get("Entity Type") in CATEGORIZED_ENTITY_TYPES and name not in names:
+                names.append(name)
+        return names
+
+    def _evict(self, pins: Dict[str, int]) -> None:
+        """Drops least recently used, unpinned results beyond cache_size; call with the lock held."""
+        excess = len(self._categories) - self.cache_size
+        if excess <= 0:
+            return
+        evicted = []
+        for name in self._categories:
+            if name not in pins:
+                evicted.append(name)
+                if len(evicted) == excess:
+                    break
+        for name in evicted:
+            del self._categories[name]
+
+    def stream(self, items: Iterable, get_record: Optional[Callable[[Any], Optional[Dict]]] = None) -> Iterator:
+        """
+        Attaches an 'Entity Categories' mapping to each record, overlapping lookups with upstream work.
+
+        Args:
+            items (Iterable): Records (or items wrapping them), pulled lazily from a separate thread
+            get_record (Optional[Callable[[Any], Optional[Dict]]]): Extracts the record from an item;
+                items it maps to None (markers, failed records) are passed through untouched
+
+        Yields:
+            The items in input order, their records annotated in place
+
+        Streams on one pipeline must not run concurrently.
+        """
+        get_record = get_record or (lambda item: item)
+        entity_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        pending: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        # Names being looked up, and names a pending record still needs (so eviction spares them);
+        # local to this stream so a straggling feeder from an abandoned stream cannot affect the next
+        in_flight = set()
+        pins: Dict[str, int] = {}
+
+        def put(q: queue.Queue, item) -> bool:
+            # Blocks while the queue is full unless the consumer has gone away
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feed() -> None:
+            try:
+                for item in items:
+                    record = get_record(item)
+                    names = self.organization_names(record) if record is not None else []
+                    for name in names:
+                        with self._resolved:
+                            pins[name] = pins.get(name, 0) + 1
+                            if name in self._categories:
+                                self._categories.move_to_end(name)
+                                continue
+                            if name in in_flight:
+                                continue
+                            in_flight.add(name)
+                        if not put(entity_queue, name):
+                            return
+                    if not put(pending, (item, record, names)):
+                        return
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                for _ in range(self.lookup_workers):
+                    put(entity_queue, _END)
+                put(pending, _END)
+
+        def lookup() -> None:
+            while True:
+                try:
+                    name = entity_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        return
+                    continue
+                if name is _END:
+                    return
+                lookup_start = time.perf_counter()
+                try:
+                    categories = self.categorizer.get_matching_categories(name)
+                except Exception as e:
+                    logger.warning(f"Categorization failed for {name}: {str(e)}")
+                    categories = []
+                with self._resolved:
+                    self._categories[name] = categories
+                    in_flight.discard(name)
+                    self._evict(pins)
+                    self.stats["entities"] += 1
+                    self.stats["lookup_seconds"] += time.perf_counter() - lookup_start
+                    self._resolved.notify_all()
+
+        feeder = threading.Thread(target=feed, name="categorize-feed", daemon=True)
+        workers = [
+            threading.Thread(target=lookup, name=f"categorize-lookup-{i}", daemon=True)
+            for i in range(self.lookup_workers)
+        ]
+        for thread in [feeder] + workers:
+            thread.start()
+
+        finished = False
+        try:
+            while True:
+                entry = pending.get()
+                if entry is _END:
+                    finished = True
+                    break
+                item, record, names = entry
+                if record is not None:
+                    with self._resolved:
+                        self._resolved.wait_for(lambda: all(name in self._categories for name in names))
+                        record["Entity Categories"] = {
+                            name: self._categories[name] for name in names if self._categories[name]
+                        }
+                        for name in names:
+                            pins[name] -= 1
+                            if not pins[name]:
+                                del pins[name]
+                        self._evict(pins)
+                    self.stats["records"] += 1
+                yield item
+        finally:
+            # The feeder may be blocked on upstream if the consumer quit early; it exits on its next put
+            stop.set()
+            for thread in workers + ([feeder] if finished else []):
+                thread.join()
+            with self._resolved:
+                self._evict({})
+
+        if errors:
+            raise errors[0]
+        logger.info(f"Categorized {self.stats['entities']} entities across {self.stats['records']} records "
+                    f"(lookups {self.stats['lookup_seconds']:.2f}s)")
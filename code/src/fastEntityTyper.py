@@ -0,0 +1,233 @@
+"""
+Rule-Based Fast-Path Entity Typer with a Gazetteer of Legal Suffixes, Titles and Jurisdictions
+
+Most names in payment data carry an unambiguous marker: a legal suffix ("Ltd"),
+a bank token, a personal title ("Mr.") or a country/financial-centre name. These
+are settled here with set lookups; only names with no marker fall through to the
+statistical spaCy model. Hit rates and timings of both paths are tracked so the
+saving can be reported.
+"""
+
+import re
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional
+from legalForms import contract_legal_forms
+
+logger = logging.getLogger(__name__)
+
+# --- Gazetteer ---
+# Peerage titles ("Lord", "Sir") are left out: they double as brand names ("Lord Abbett")
+PERSON_TITLES = {
+    "mr", "mrs", "ms", "miss", "mx", "dr", "madam", "prof", "professor"
+}
+
+BANK_TOKENS = {
+    "bank", "banque", "banco", "banca", "bancorp", "bankhaus", "nbd", "sparkasse", "landesbank"
+}
+
+# Distinctive legal forms, trusted anywhere in a name
+LEGAL_SUFFIXES = {
+    "ltd", "limited", "inc", "incorporated", "corp", "corporation", "llc", "llp", "plc",
+    "gmbh", "sarl", "srl", "pty", "pte", "fze", "fzco", "fzc"
+}
+
+# Ordinary words that only mark an organization as the last word ("Group Treasury" is not one)
+GENERIC_ORG_WORDS = {
+    "co", "company", "holdings", "holding", "group", "partners", "capital", "trading", "ventures",
+    "enterprises", "industries", "associates", "investments", "foundation", "charity", "fund", "org",
+    "organisation", "organization"
+}
+
+# Short forms that double as name parts ("Maria Sa"); trusted only as the last word written in capitals
+SHORT_LEGAL_SUFFIXES = {"sa", "ag", "lp", "nv", "bv", "spa", "sas"}
+
+JURISDICTIONS = {
+    # Countries and common abbreviations
+    "afghanistan", "argentina", "australia", "austria", "bahamas", "bahrain", "belgium", "belize",
+    "bermuda", "brazil", "british virgin islands", "bvi", "canada", "cayman islands", "china", "cuba",
+    "cyprus", "denmark", "egypt", "france", "germany", "gibraltar", "greece", "guernsey",
+    "hong kong", "india", "indonesia", "iran", "iraq", "ireland", "isle of man", "israel", "italy",
+    "japan", "jersey", "kuwait", "lebanon", "liechtenstein", "luxembourg", "malaysia", "malta",
+    "mexico", "monaco", "myanmar", "netherlands", "new zealand", "nigeria", "north korea", "norway",
+    "oman", "pakistan", "panama", "philippines", "poland", "portugal", "qatar", "russia",
+    "saudi arabia", "seychelles", "singapore", "south africa", "south korea", "spain", "sweden",
+    "switzerland", "syria", "taiwan", "thailand", "turkey", "uae", "uk", "ukraine",
+    "united arab emirates", "united kingdom", "united states", "us", "usa", "venezuela", "vietnam",
+    # Financial centres
+    "abu dhabi", "amsterdam", "dubai", "frankfurt", "geneva", "london", "los angeles", "madrid",
+    "milan", "moscow", "mumbai", "new york", "paris", "san francisco", "shanghai", "sydney",
+    "tokyo", "toronto", "zurich"
+}
+
+# --- Precompiled Regex Patterns ---
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s,]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def fast_entity_type(name: Optional[str]) -> Optional[str]:
+    """
+    Types a name from the gazetteer alone.
+
+    Args:
+        name (Optional[str]): Entity name
+
+    Returns:
+        Optional[str]: 'Person', 'Bank', 'Organization' or 'Jurisdiction', or None if ambiguous
+    """
+    if not name or not isinstance(name, str):
+        return None
+
+    # Dots are dropped rather than split on so "S.A." reads as "SA"
+    raw = WHITESPACE_PATTERN.sub(' ', PUNCTUATION_PATTERN.sub(' ', name.replace('.', ''))).strip()
+    raw_tokens = raw.replace(',', ' ').split()
+    if not raw_tokens:
+        return None
+
+    cleaned = raw.lower()
+    # Expanded legal forms ("gesellschaft mit beschränkter haftung") read as their abbreviations
+    tokens = contract_legal_forms(cleaned.replace(',', ' ')).split()
+    token_set = set(tokens)
+
+    if token_set & BANK_TOKENS:
+        return "Bank"
+
+    # A legal form outranks a leading title ("Sir Kensington Holdings")
+    last = raw_tokens[-1]
+    if (token_set & LEGAL_SUFFIXES or tokens[-1] in GENERIC_ORG_WORDS
+            or (last.lower() in SHORT_LEGAL_SUFFIXES and not (last.istitle() or last.islower()))):
+        return "Organization"
+
+    if tokens[0] in PERSON_TITLES and len(tokens) > 1:
+        return "Person"
+
+    # Every comma-separated part must be a known place ("Dubai, UAE")
+    parts = [part.strip() for part in cleaned.split(',') if part.strip()]
+    if parts and all(part in JURISDICTIONS for part in parts):
+        return "Jurisdiction"
+
+    return None
+
+
+class FastPathStats:
+    """
+    Thread-safe counters for how names were typed and how long each path took.
+
+    Names settled by caller rules (e.g. ENTITY_KEYWORDS) never reached NER even before
+    the gazetteer existed, so they are counted apart and take no part in the saving.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.rule_count = 0
+            self.gazetteer_count = 0
+            self.gazetteer_seconds = 0.0
+            self.ner_count = 0
+            self.ner_seconds = 0.0
+
+    def record(self, path: str, gazetteer_seconds: float = 0.0, ner_seconds: float = 0.0) -> None:
+        """
+        Records one typed name.
+
+        Args:
+            path (str): 'rule', 'gazetteer' or 'ner', whichever settled the name
+            gazetteer_seconds (float): Time spent on the gazetteer check, hit or miss
+            ner_seconds (float): Time spent in the NER fallback
+        """
+        with self._lock:
+            if path == "rule":
+                self.rule_count += 1
+            elif path == "gazetteer":
+                self.gazetteer_count += 1
+            elif path == "ner":
+                self.ner_count += 1
+            else:
+                raise ValueError(f"Unknown typing path: {path}")
+            self.gazetteer_seconds += gazetteer_seconds
+            self.ner_seconds += ner_seconds
+
+    def report(self) -> Dict[str, float]:
+        """
+        Summarizes gazetteer coverage and the latency it saved.
+
+        Returns:
+            Dict[str, float]: Name counts per path, the fraction of would-be NER names the
+            gazetteer settled, mean ms per gazetteer check and per NER call, and the estimated
+            ms saved net of the checks on names that still went to NER
+        """
+        with self._lock:
+            checked = self.gazetteer_count + self.ner_count
+            gazetteer_ms = 1000 * self.gazetteer_seconds / checked if checked else 0.0
+            ner_ms = 1000 * self.ner_seconds / self.ner_count if self.ner_count else 0.0
+            return {
+                "names": self.rule_count + checked,
+                "rule_names": self.rule_count,
+                "gazetteer_names": self.gazetteer_count,
+                "ner_names": self.ner_count,
+                "fast_path_fraction": round(self.gazetteer_count / checked, 4) if checked else 0.0,
+                "gazetteer_ms_per_name": round(gazetteer_ms, 4),
+                "ner_ms_per_name": round(ner_ms, 4),
+                # Only meaningful once some names have reached NER to measure its cost
+                "estimated_ms_saved": round(self.gazetteer_count * ner_ms - checked * gazetteer_ms, 2)
+            }
+
+
+fast_path_stats = FastPathStats()
+
+
+def type_entity(name: str, ner_fallback: Callable[[str], str],
+                rules: Optional[Callable[[str], Optional[str]]] = None) -> str:
+    """
+    Types a name via caller rules and the gazetteer, reaching NER only for ambiguous names.
+
+    Args:
+        name (str): Entity name
+        ner_fallback (Callable[[str], str]): Statistical typer for names the rules cannot settle
+        rules (Optional[Callable[[str], Optional[str]]]): Caller-specific rules tried first
+
+    Returns:
+        str: The entity type
+    """
+    entity_type = rules(name) if rules else None
+    if entity_type:
+        fast_path_stats.record("rule")
+        return entity_type
+
+    start = time.perf_counter()
+    entity_type = fast_entity_type(name)
+    gazetteer_seconds = time.perf_counter() - start
+    if entity_type:
+        fast_path_stats.record("gazetteer", gazetteer_seconds)
+        return entity_type
+
+    start = time.perf_counter()
+    entity_type = ner_fallback(name)
+    fast_path_stats.record("ner", gazetteer_seconds, time.perf_counter() - start)
+    return entity_type
+
+
+if __name__ == "__main__":
+    from processUnstructured import read_unstructured_file, ner_entity_type
+    from nlpModel import get_nlp
+
+    # Compare typing every NER-detected name with and without the fast path
+    names = [ent.text for data in read_unstructured_file('data/transactions.txt') for ent in get_nlp()(data).ents]
+
+    start = time.perf_counter()
+    for name in names:
+        ner_entity_type(name)
+    ner_only = time.perf_counter() - start
+
+    fast_path_stats.reset()
+    start = time.perf_counter()
+    for name in names:
+        type_entity(name, ner_entity_type)
+    with_fast_path = time.perf_counter() - start
+
+    print(fast_path_stats.report())
+    print(f"{len(names)} names: NER only {1000 * ner_only:.1f}ms, with fast path {1000 * with_fast_path:.1f}ms")
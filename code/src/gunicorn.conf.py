@@ -0,0 +1,50 @@
+"""
+Gunicorn Production Configuration for the Transaction Processing API
+
+Run from code/src:
+    gunicorn -c gunicorn.conf.py inputProcessor:app
+
+The app (and with it the spaCy model) is imported once in the master and
+forked into the workers, so model memory is shared copy-on-write instead of
+being loaded per worker. All settings can be overridden through the
+environment variables below.
+"""
+
+import gc
+import os
+import multiprocessing
+
+# --- Binding ---
+bind = f"0.0.0.0:{os.environ.get('PORT', '8002')}"
+
+# --- Workers ---
+# NER is CPU-bound, so default to one process per core; threads cover request I/O
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", "2"))
+worker_class = "gthread"
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to bound memory creep from copy-on-write page drift
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = 100
+
+# --- Request Limits (body size is enforced by Flask's MAX_CONTENT_LENGTH / MAX_UPLOAD_MB) ---
+limit_request_line = 4094
+limit_request_fields = 100
+limit_request_field_size = 8190
+
+# --- Logging ---
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    # Move everything imported by the preloaded app into the permanent generation so the
+    # cyclic GC in workers does not touch (and thereby copy) the shared model pages
+    gc.collect()
+    gc.freeze()
+    server.log.info("Preloaded app; GC frozen before forking workers")
@@ -2,11 +2,16 @@ from flask import make_response
 from flask import Flask, request, jsonify
 import os
 import json
+import uuid
 import logging
 from typing import Dict, List
 from processStructured import process_structured_transactions
 from processUnstructured import process_unstructured_transactions, read_unstructured_file
+from riskScoring import score_transactions
+from sanctionsScreening import SanctionsScreener
+from fastEntityTyper import fast_path_stats
 from flask_cors import CORS
+from werkzeug.utils import secure_filename
 
 # --- Configure Logging ---
 logging.basicConfig(level=logging.INFO,
@@ -14,8 +19,12 @@ logging.basicConfig(level=logging.INFO,
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+# Reject oversized uploads before they are buffered (413); override with MAX_UPLOAD_MB
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', '16')) * 1024 * 1024
 CORS(app)  # Enable CORS for all routes
 
+sanctions_screener = SanctionsScreener()
+
 
 @app.after_request
 def add_cors_headers(response):
@@ -25,17 +34,26 @@ def add_cors_headers(response):
     return response
 
 
+@app.errorhandler(413)
+def upload_too_large(error):
+    limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    logger.warning(f"Rejected upload larger than {limit_mb} MB")
+    return jsonify({"error": f"File too large. Maximum upload size is {limit_mb} MB."}), 413
+
+
 def process_transactions(input_file_path: str) -> List[Dict]:
-    """Determines file type and processes transactions accordingly."""
+    """Determines file type, processes transactions accordingly, then screens and scores them."""
     try:
         if input_file_path.endswith('.csv'):
-            return process_structured_transactions(input_file_path)
+            transactions = process_structured_transactions(input_file_path)
         elif input_file_path.endswith('.txt'):
             unstructured_data = read_unstructured_file(input_file_path)
-            return process_unstructured_transactions(unstructured_data)
+            transactions = process_unstructured_transactions(unstructured_data)
         else:
             logger.error(f"Unsupported file type: {input_file_path}")
             return []
+        logger.info(f"Entity typing since start: {fast_path_stats.report()}")
+        return score_transactions(sanctions_screener.screen_transactions(transactions))
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
         return []
@@ -59,28 +77,42 @@ def upload_file():
         logger.warning(f"Unsupported file type uploaded: {file.filename}")
         return jsonify({"error": "Unsupported file type. Please upload a .csv or .txt file."}), 400
 
-    # Save the uploaded file temporarily
+    # Save the uploaded file temporarily; the unique prefix keeps concurrent uploads of the same name apart
     os.makedirs('uploads', exist_ok=True)  # Ensure uploads directory exists
-    input_file_path = os.path.join('uploads', file.filename)
+    base_name, extension = os.path.splitext(file.filename)
+    safe_filename = f"{secure_filename(base_name) or 'upload'}{extension}"
+    input_file_path = os.path.join('uploads', f"{uuid.uuid4().hex}_{safe_filename}")
     file.save(input_file_path)
     logger.info(f"File saved: {input_file_path}")
 
-    # Process transactions
-    processed_data = process_transactions(input_file_path)
+    try:
+        # Process transactions
+        processed_data = process_transactions(input_file_path)
+    finally:
+        # The upload is only needed while processing; don't let uploads/ grow without bound
+        try:
+            os.remove(input_file_path)
+        except OSError as e:
+            logger.warning(f"Failed to remove upload {input_file_path}: {str(e)}")
 
     if processed_data:
         os.makedirs('data', exist_ok=True)  # Ensure data directory exists
-        output_filename = f"processed_{os.path.splitext(file.filename)[0]}.json"
+        output_filename = f"processed_{os.path.splitext(safe_filename)[0]}.json"
         output_file_path = os.path.join('data', output_filename)
+        # Unique per request and in the output directory so os.replace stays a same-filesystem rename
+        tmp_file_path = os.path.join('data', f"{os.path.basename(input_file_path)}.json.tmp")
 
         try:
-            with open(output_file_path, 'w', encoding='utf-8') as f:
+            # Write then rename so concurrent requests never leave a half-written output file
+            with open(tmp_file_path, 'w', encoding='utf-8') as f:
                 json.dump(processed_data, f, indent=2)
+            os.replace(tmp_file_path, output_file_path)
             logger.info(f"Processed transactions saved to {output_file_path}")
-            print(processed_data)
             return jsonify({"message": "File processed successfully", "output_json": processed_data}), 200
-        except IOError as e:
+        except (IOError, TypeError, ValueError) as e:
             logger.error(f"Failed to write output file: {str(e)}")
+            if os.path.exists(tmp_file_path):
+                os.remove(tmp_file_path)
             return jsonify({"error": "Failed to write output"}), 500
 
     logger.error("No data processed from file")
@@ -88,5 +120,7 @@ def upload_file():
 
 
 if __name__ == "__main__":
-    # Allow external access if needed
-    app.run(host='0.0.0.0', port=8002, debug=True)
+    # Development server only; for production use `gunicorn -c gunicorn.conf.py inputProcessor:app`.
+    # Debug mode (and its reloader, which re-imports the spaCy model) is opt-in via FLASK_DEBUG=1.
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', '8002')),
+            debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -0,0 +1,38 @@
+"""
+Legal-Form Abbreviations Shared by Name Standardization and Sanctions Screening
+"""
+
+import re
+
+# --- Constants ---
+ABBREVIATION_MAP = {
+    "corp": "corporation",
+    "inc": "incorporated",
+    "ltd": "limited",
+    "co": "company",
+    "intl": "international",
+    "plc": "public limited company",
+    "llc": "limited liability company",
+    "gmbh": "gesellschaft mit beschränkter haftung",
+    "org": "organisation"
+}
+
+# --- Precompiled Regex Patterns ---
+# Longest expansion first so "public limited company" wins over "limited" and "company"
+EXPANSION_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(full) for full in sorted(ABBREVIATION_MAP.values(), key=len, reverse=True)) + r')\b'
+)
+CONTRACTION_MAP = {full: abbrev for abbrev, full in ABBREVIATION_MAP.items()}
+
+
+def contract_legal_forms(name: str) -> str:
+    """
+    Maps expanded legal forms in a lowercased name back to their abbreviations.
+
+    Args:
+        name (str): Lowercased name, e.g. 'oceanic holdings limited liability company'
+
+    Returns:
+        str: The name with expansions contracted, e.g. 'oceanic holdings llc'
+    """
+    return EXPANSION_PATTERN.sub(lambda match: CONTRACTION_MAP[match.group(1)], name)
@@ -0,0 +1,94 @@
+"""
+Concurrent Load Test for the /upload Endpoint
+
+Usage:
+    python loadTest.py --file data/transactions.csv --requests 200 --concurrency 16
+"""
+
+import os
+import time
+import uuid
+import argparse
+import statistics
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+
+def build_multipart(file_path: str) -> Tuple[bytes, str]:
+    """Encodes a file as the multipart/form-data body the UI sends."""
+    boundary = uuid.uuid4().hex
+    with open(file_path, 'rb') as f:
+        content = f.read()
+
+    body = (
+        f"--{boundary}\r\n"
+        f"Content-Disposition: form-data; name=\"file\"; filename=\"{os.path.basename(file_path)}\"\r\n"
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode('utf-8') + content + f"\r\n--{boundary}--\r\n".encode('utf-8')
+
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def send_upload(url: str, body: bytes, content_type: str, timeout: float) -> Tuple[int, float]:
+    """Posts one upload and returns (HTTP status, latency in seconds); status 0 means no response."""
+    request = urllib.request.Request(url, data=body, method='POST', headers={"Content-Type": content_type})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_load_test(url: str, file_path: str, total_requests: int, concurrency: int,
+                  timeout: float = 120.0) -> Dict:
+    """
+    Fires total_requests uploads at url with the given concurrency.
+
+    Returns:
+        Dict: Request counts, throughput and latency percentiles in milliseconds
+    """
+    body, content_type = build_multipart(file_path)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(
+            lambda _: send_upload(url, body, content_type, timeout), range(total_requests)
+        ))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency * 1000 for status, latency in results if status == 200]
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "succeeded": len(latencies),
+        "failed": total_requests - len(latencies),
+        "throughput_rps": round(total_requests / elapsed, 2),
+        "mean_ms": round(statistics.mean(latencies), 1) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 1) if latencies else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test concurrent /upload calls against a local server.")
+    parser.add_argument("--url", default="http://localhost:8002/upload", help="Upload endpoint URL")
+    parser.add_argument("--file", default=os.path.join("data", "transactions.csv"), help="File to upload")
+    parser.add_argument("--requests", type=int, default=100, help="Total number of uploads")
+    parser.add_argument("--concurrency", type=int, nargs='+', default=[1, 4, 16], help="Concurrency levels")
+    args = parser.parse_args()
+
+    for level in args.concurrency:
+        print(run_load_test(args.url, args.file, args.requests, level))
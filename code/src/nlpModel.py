@@ -0,0 +1,14 @@
+"""
+Shared spaCy Model Loader
+"""
+
+from functools import lru_cache
+import spacy
+
+MODEL_NAME = "en_core_web_lg"
+
+
+@lru_cache(maxsize=None)
+def get_nlp(model_name: str = MODEL_NAME):
+    """Loads a spaCy model once per process so every processor shares the same pipeline."""
+    return spacy.load(model_name)
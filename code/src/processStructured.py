@@ -8,7 +8,9 @@ import re
 import logging
 from typing import Dict, List, Optional, Union
 import pandas as pd
-import spacy
+from nlpModel import get_nlp
+from fastEntityTyper import type_entity
+from legalForms import ABBREVIATION_MAP
 
 # --- Configure Logging ---
 logging.basicConfig(
@@ -18,21 +20,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # --- Load spaCy Model ---
-nlp = spacy.load("en_core_web_lg")
+nlp = get_nlp()
 
 # --- Constants ---
-ABBREVIATION_MAP = {
-    "corp": "corporation",
-    "inc": "incorporated",
-    "ltd": "limited",
-    "co": "company",
-    "intl": "international",
-    "plc": "public limited company",
-    "llc": "limited liability company",
-    "gmbh": "gesellschaft mit beschränkter haftung",
-    "org": "organisation"
-}
-
 ENTITY_KEYWORDS = {
     "Bank": {"bank", "finance", "nbd", "deutsche", "credit", "trust"},
     "Organization": {"ltd", "corp", "inc", "plc", "llc", "gmbh", "co", "trading", "org", "intl"},
@@ -41,6 +31,9 @@ ENTITY_KEYWORDS = {
     "Person": {"mr", "mrs", "ms", "dr", "miss"}
 }
 
+# A transactions file names its sender under one of these columns
+SENDER_NAME_COLUMNS = ("Sender Name", "Payer Name")
+
 REQUIRED_FIELDS = [
     "Date",
     "Transaction Type",
@@ -82,11 +75,8 @@ def robust_standardize(name: Optional[str], abbrev_map: Dict[str, str]) -> Optio
     return WHITESPACE_PATTERN.sub(' ', name)
 
 
-def identify_entity_type(name: Optional[str]) -> str:
-    """Identifies entity type using multi-level keyword matching with spaCy fallback."""
-
-    if not name or not isinstance(name, str):
-        return "Unknown"
+def keyword_entity_type(name: str) -> Optional[str]:
+    """Identifies entity type from ENTITY_KEYWORDS, or None if no keyword matches."""
 
     lower_name = name.lower()
 
@@ -106,7 +96,12 @@ def identify_entity_type(name: Optional[str]) -> str:
     if any(keyword in lower_name for keyword in ENTITY_KEYWORDS["Person"]):
         return "Person"
 
-    # Fallback to spaCy NER
+    return None
+
+
+def ner_entity_type(name: str) -> str:
+    """Identifies entity type using spaCy NER."""
+
     doc = nlp(name)
 
     for ent in doc.ents:
@@ -121,6 +116,15 @@ def identify_entity_type(name: Optional[str]) -> str:
     return 'Unknown'
 
 
+def identify_entity_type(name: Optional[str]) -> str:
+    """Identifies entity type using keyword matching and the gazetteer fast path, with spaCy fallback."""
+
+    if not name or not isinstance(name, str):
+        return "Unknown"
+
+    return type_entity(name, ner_entity_type, rules=keyword_entity_type)
+
+
 def clean_amount(value: Union[str, float, int]) -> str:
     """Converts amount strings to numeric format."""
 
@@ -133,6 +137,9 @@ def clean_amount(value: Union[str, float, int]) -> str:
 def process_transaction_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """Processes raw transaction DataFrame with data normalization."""
 
+    if not any(col in df for col in SENDER_NAME_COLUMNS):
+        raise ValueError(f"Not a transactions file: expected one of the columns {', '.join(SENDER_NAME_COLUMNS)}")
+
     # Column standardization
     df = df.rename(columns={
         'Transaction': 'Transaction ID',
@@ -163,50 +170,52 @@ def process_transaction_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def build_transaction_record(row: pd.Series) -> Dict:
+    """Constructs a single structured JSON record from a processed DataFrame row."""
+
+    # Empty CSV cells arrive as NaN, which JSON cannot represent
+    row = row.astype(object).where(row.notna(), None)
+
+    sender_type = identify_entity_type(row["Sender Name"])
+    receiver_type = identify_entity_type(row["Receiver Name"])
+
+    return {
+        'Raw Transaction': json.dumps(row.to_dict(), indent=2),
+        'Transaction ID': row['Transaction ID'],
+        'Date': row['Date'],
+        'Amount': row['Amount'],
+        'Transaction Type': row['Transaction Type'],
+        'Reference': row['Reference'],
+        'Sender': {
+            'Name': row['Sender Name'],
+            'Account': row['Sender Account'],
+            'Jurisdiction': row['Sender Address'],
+            'Additional Info': []
+        },
+        'Receiver': {
+            'Name': row['Receiver Name'],
+            'Account': row['Receiver Account'],
+            'Jurisdiction': row['Receiver Address'],
+            'Additional Info': []
+        },
+        'Transaction Details': {
+            'Notes': row['Notes']
+        },
+        'Proper Noun Entities': [
+            {'Entity Name': row['Sender Name'],
+                'Entity Type': sender_type},
+            {'Entity Name': row['Receiver Name'],
+                'Entity Type': receiver_type},
+            {'Entity Name': row.get(
+                'Receiver Country', ''), 'Entity Type': 'Jurisdiction'}
+        ]
+    }
+
+
 def build_transaction_json(df: pd.DataFrame) -> List[Dict]:
     """Constructs structured JSON output from processed DataFrame."""
 
-    transactions = []
-
-    for _, row in df.iterrows():
-        sender_type = identify_entity_type(row["Sender Name"])
-        receiver_type = identify_entity_type(row["Receiver Name"])
-
-        transaction_data = {
-            'Raw Transaction': json.dumps(row.to_dict(), indent=2),
-            'Transaction ID': row['Transaction ID'],
-            'Date': row['Date'],
-            'Amount': row['Amount'],
-            'Transaction Type': row['Transaction Type'],
-            'Reference': row['Reference'],
-            'Sender': {
-                'Name': row['Sender Name'],
-                'Account': row['Sender Account'],
-                'Jurisdiction': row['Sender Address'],
-                'Additional Info': []
-            },
-            'Receiver': {
-                'Name': row['Receiver Name'],
-                'Account': row['Receiver Account'],
-                'Jurisdiction': row['Receiver Address'],
-                'Additional Info': []
-            },
-            'Transaction Details': {
-                'Notes': row['Notes']
-            },
-            'Proper Noun Entities': [
-                {'Entity Name': row['Sender Name'],
-                    'Entity Type': sender_type},
-                {'Entity Name': row['Receiver Name'],
-                    'Entity Type': receiver_type},
-                {'Entity Name': row.get(
-                    'Receiver Country', ''), 'Entity Type': 'Jurisdiction'}
-            ]
-        }
-
-        transactions.append(transaction_data)
-
-    return transactions
+    return [build_transaction_record(row) for _, row in df.iterrows()]
 
 
 def process_structured_transactions(csv_path: str) -> List[Dict]:
@@ -1,10 +1,11 @@
 import re
 import json
-from typing import List, Dict, Optional
-import spacy
+from typing import Iterator, List, Dict, Optional
+from nlpModel import get_nlp
+from fastEntityTyper import type_entity
 
 # Load spaCy model
-nlp = spacy.load("en_core_web_lg")
+nlp = get_nlp()
 
 def parse_unstructured_data(text: str) -> Dict[str, Optional[str]]:
     """Parses unstructured transaction data and extracts relevant fields."""
@@ -84,11 +85,8 @@ def parse_unstructured_data(text: str) -> Dict[str, Optional[str]]:
     
     return extracted_data
 
-def identify_entity_type(name: Optional[str]) -> str:
+def ner_entity_type(name: str) -> str:
     """Identifies entity type using spaCy NER."""
-    if not name or not isinstance(name, str):
-        return "Unknown"
-
     doc = nlp(name)
     
     for ent in doc.ents:
@@ -101,6 +99,13 @@ def identify_entity_type(name: Optional[str]) -> str:
     
     return 'Unknown'
 
+def identify_entity_type(name: Optional[str]) -> str:
+    """Identifies entity type via the rule-based fast path, falling back to spaCy NER."""
+    if not name or not isinstance(name, str):
+        return "Unknown"
+
+    return type_entity(name, ner_entity_type)
+
 def filter_entities(entities: List[Dict]) -> List[Dict]:
     """Filters entities to include only relevant types: organizations, persons, jurisdictions."""
     filtered_entities = []
@@ -111,74 +116,78 @@ def filter_entities(entities: List[Dict]) -> List[Dict]:
     
     return filtered_entities
 
-def process_unstructured_transactions(unstructured_data: List[str]) -> List[Dict]:
-    """Processes a list of unstructured transaction strings into structured format."""
-    structured_transactions = []
+def build_unstructured_record(data: str, parsed_data: Dict) -> Dict:
+    """Builds one structured transaction record from parsed fields and spaCy NER over the raw text."""
     
-    for data in unstructured_data:
-        parsed_data = parse_unstructured_data(data)
+    # Construct the structured transaction record
+    transaction_record = {
+        "Raw Transaction": data.strip(),
+        "Transaction ID": parsed_data.get("Transaction ID", ""),
+        "Date": parsed_data.get("Date", ""),
+        "Amount": parsed_data.get("Amount", ""),
+        "Currency Exchange": parsed_data.get("Currency Exchange", ""),
+        "Transaction Type": parsed_data.get("Transaction Type", ""),
+        "Reference": parsed_data.get("Reference", ""),
         
-        # Construct the structured transaction record
-        transaction_record = {
-            "Raw Transaction": data.strip(),
-            "Transaction ID": parsed_data.get("Transaction ID", ""),
-            "Date": parsed_data.get("Date", ""),
-            "Amount": parsed_data.get("Amount", ""),
-            "Currency Exchange": parsed_data.get("Currency Exchange", ""),
-            "Transaction Type": parsed_data.get("Transaction Type", ""),
-            "Reference": parsed_data.get("Reference", ""),
-            
-            # Sender Details
-            "Sender": {
-                "Name": parsed_data["Sender"].get("Name"),
-                "Account": parsed_data["Sender"].get("Account"),
-                "Jurisdiction": parsed_data["Sender"].get("Jurisdiction"),
-                "Additional Info": [
-                    f"{k.capitalize().replace('_', ' ')}: {v}" 
-                    for k, v in parsed_data["Sender"].items() 
-                    if k not in ["Name", "Account", "Jurisdiction"]
-                ]
-            },
-            
-            # Receiver Details
-            "Receiver": {
-                "Name": parsed_data["Receiver"].get("Name"),
-                "Account": parsed_data["Receiver"].get("Account"),
-                "Jurisdiction": parsed_data["Receiver"].get("Jurisdiction"),
-                "Additional Info": [
-                    f"{k.capitalize().replace('_', ' ')}: {v}" 
-                    for k, v in parsed_data["Receiver"].items() 
-                    if k not in ["Name", "Account", "Jurisdiction"]
-                ]
-            },
-            
-            # Transaction Details
-            "Transaction Details": {
-                "Notes": parsed_data.get("Transaction Notes", "").splitlines() if parsed_data.get("Transaction Notes") else []
-            },
-            
-            # Proper Noun Entities (Extracted using spaCy NER)
-            "Proper Noun Entities": []
-        }
+        # Sender Details
+        "Sender": {
+            "Name": parsed_data["Sender"].get("Name"),
+            "Account": parsed_data["Sender"].get("Account"),
+            "Jurisdiction": parsed_data["Sender"].get("Jurisdiction"),
+            "Additional Info": [
+                f"{k.capitalize().replace('_', ' ')}: {v}" 
+                for k, v in parsed_data["Sender"].items() 
+                if k not in ["Name", "Account", "Jurisdiction"]
+            ]
+        },
         
-        # Use spaCy to extract entities from the full text of the transaction
-        doc = nlp(data)
+        # Receiver Details
+        "Receiver": {
+            "Name": parsed_data["Receiver"].get("Name"),
+            "Account": parsed_data["Receiver"].get("Account"),
+            "Jurisdiction": parsed_data["Receiver"].get("Jurisdiction"),
+            "Additional Info": [
+                f"{k.capitalize().replace('_', ' ')}: {v}" 
+                for k, v in parsed_data["Receiver"].items() 
+                if k not in ["Name", "Account", "Jurisdiction"]
+            ]
+        },
         
-        seen_entities = set()
+        # Transaction Details
+        "Transaction Details": {
+            "Notes": parsed_data.get("Transaction Notes", "").splitlines() if parsed_data.get("Transaction Notes") else []
+        },
         
-        for ent in doc.ents:
-            entity_info = {
-                'Entity Name': ent.text,
-                'Entity Type': identify_entity_type(ent.text)
-            }
-            
-            if entity_info['Entity Type'] != 'Unknown' and ent.text not in seen_entities:
-                transaction_record["Proper Noun Entities"].append(entity_info)
-                seen_entities.add(ent.text)
+        # Proper Noun Entities (Extracted using spaCy NER)
+        "Proper Noun Entities": []
+    }
+    
+    # Use spaCy to extract entities from the full text of the transaction
+    doc = nlp(data)
+    
+    seen_entities = set()
+    
+    for ent in doc.ents:
+        entity_info = {
+            'Entity Name': ent.text,
+            'Entity Type': identify_entity_type(ent.text)
+        }
+        
+        if entity_info['Entity Type'] != 'Unknown' and ent.text not in seen_entities:
+            transaction_record["Proper Noun Entities"].append(entity_info)
+            seen_entities.add(ent.text)
 
-        transaction_record["Proper Noun Entities"] = filter_entities(transaction_record["Proper Noun Entities"])
+    transaction_record["Proper Noun Entities"] = filter_entities(transaction_record["Proper Noun Entities"])
 
-        structured_transactions.append(transaction_record)
+    return transaction_record
+
+def process_unstructured_transactions(unstructured_data: List[str]) -> List[Dict]:
+    """Processes a list of unstructured transaction strings into structured format."""
+    structured_transactions = []
+    
+    for data in unstructured_data:
+        parsed_data = parse_unstructured_data(data)
+        structured_transactions.append(build_unstructured_record(data, parsed_data))
     
     return structured_transactions
 
@@ -187,6 +196,22 @@ def read_unstructured_file(file_path: str) -> List[str]:
     with open(file_path, 'r', encoding='utf-8') as file:
         return file.read().strip().split("\n---\n")  # Split by '---' delimiter
 
+def iter_unstructured_file(file_path: str) -> Iterator[str]:
+    """Lazily yields transaction chunks from a text file split on '---' lines."""
+    chunk = []
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.rstrip('\r\n') == '---':
+                text = ''.join(chunk).strip()
+                if text:
+                    yield text
+                chunk = []
+            else:
+                chunk.append(line)
+    text = ''.join(chunk).strip()
+    if text:
+        yield text
+
 if __name__ == "__main__":
     input_file_path = 'data/transactions.txt'  # Path to your input .txt file
     
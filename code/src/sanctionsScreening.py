@@ -0,0 +1,399 @@
+"""
+Sanctions / Watchlist Screening against a Local List with an Indexed Fuzzy Matcher
+"""
+
+import os
+import csv
+import re
+import math
+import time
+import bisect
+import random
+import argparse
+import logging
+import threading
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from legalForms import contract_legal_forms
+
+logger = logging.getLogger(__name__)
+
+# --- Constants ---
+DEFAULT_LIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "watchlists", "sanctions_list.csv")
+
+# Tokens dropped before matching so "Mr. Viktor Petrov" and "Quantum Holdings" hit their list entries.
+# Expanded legal forms are contracted first, so only the abbreviations need listing here.
+IGNORED_TOKENS = {
+    "mr", "mrs", "ms", "dr", "miss", "sir",
+    "ltd", "inc", "corp", "co", "llc", "plc", "gmbh", "sa", "ag", "fze", "fzco", "the"
+}
+
+# Roughly the number of entries on the OFAC SDN list; used by the benchmark
+SDN_ENTRY_COUNT = 18000
+SYLLABLES = ["ka", "ri", "mo", "sa", "el", "an", "to", "vi", "ra", "ne", "lo", "mi", "de", "or", "us", "ha"]
+ENTITY_WORDS = ["Trading", "Holdings", "Shipping", "Group", "Petroleum", "Bank", "Industries", "Capital"]
+
+# --- Precompiled Regex Patterns ---
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# --- Helper Functions ---
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Lowercases, strips punctuation, titles and legal suffixes from a name.
+
+    Legal forms are contracted through the same ABBREVIATION_MAP that the structured
+    processor expands with, so 'Oceanic Holdings Limited Liability Company' and
+    'Oceanic Holdings LLC' normalize alike.
+    """
+    if not name or not isinstance(name, str):
+        return ""
+
+    name = PUNCTUATION_PATTERN.sub(' ', name.lower().replace('-', ' '))
+    name = contract_legal_forms(WHITESPACE_PATTERN.sub(' ', name).strip())
+    tokens = [token for token in WHITESPACE_PATTERN.split(name) if token and token not in IGNORED_TOKENS]
+    return ' '.join(tokens)
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Returns the padded character trigrams of a normalized name."""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def read_sanctions_csv(path: str) -> List[Dict]:
+    """Reads a list with uid,name,type,program,aliases columns (aliases ';'-separated)."""
+    entries = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if not row.get("name"):
+                continue
+            entries.append({
+                "uid": row.get("uid", ""),
+                "name": row["name"].strip(),
+                "type": row.get("type", ""),
+                "program": row.get("program", ""),
+                "aliases": [a.strip() for a in (row.get("aliases") or "").split(';') if a.strip()]
+            })
+    return entries
+
+
+def read_sanctions_xml(path: str) -> List[Dict]:
+    """Reads an OFAC SDN-style XML list (sdnEntry with firstName/lastName and akaList)."""
+
+    def local(tag: str) -> str:
+        return tag.rsplit('}', 1)[-1]
+
+    def child_text(element: ET.Element, name: str) -> str:
+        for child in element:
+            if local(child.tag) == name:
+                return (child.text or "").strip()
+        return ""
+
+    def full_name(element: ET.Element) -> str:
+        return ' '.join(part for part in (child_text(element, "firstName"), child_text(element, "lastName")) if part)
+
+    entries = []
+    for entry in ET.parse(path).getroot().iter():
+        if local(entry.tag) != "sdnEntry":
+            continue
+        name = full_name(entry)
+        if not name:
+            continue
+        aliases = [full_name(aka) for aka in entry.iter() if local(aka.tag) == "aka"]
+        programs = [(p.text or "").strip() for p in entry.iter() if local(p.tag) == "program"]
+        entries.append({
+            "uid": child_text(entry, "uid"),
+            "name": name,
+            "type": child_text(entry, "sdnType"),
+            "program": ';'.join(p for p in programs if p),
+            "aliases": [a for a in aliases if a]
+        })
+    return entries
+
+
+class SanctionsIndex:
+    """
+    Immutable lookup structures built once per list load.
+
+    Fuzzy matching scores the trigram Dice coefficient of the query against list
+    names. A name can only reach the threshold if its trigram count lies in a
+    window around the query's, so every posting list is kept sorted by name
+    length and only the in-window slice is read. Shared-trigram counts over those
+    slices are accumulated with NumPy, and Dice is computed for all candidates at
+    once, so no per-candidate set work is done.
+    """
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        self.exact: Dict[str, List[int]] = defaultdict(list)
+        self.token_sets: Dict[frozenset, List[int]] = defaultdict(list)
+        self.name_owner: List[int] = []
+        self.name_text: List[str] = []
+
+        lengths: List[int] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for entry_id, entry in enumerate(entries):
+            for name in [entry["name"], *entry["aliases"]]:
+                normalized = normalize_name(name)
+                if not normalized:
+                    continue
+                name_id = len(self.name_text)
+                grams = trigrams(normalized)
+                self.exact[normalized].append(name_id)
+                self.token_sets[frozenset(normalized.split())].append(name_id)
+                for gram in grams:
+                    postings[gram].append(name_id)
+                lengths.append(len(grams))
+                self.name_owner.append(entry_id)
+                self.name_text.append(name)
+
+        self.name_lengths = np.array(lengths, dtype=np.int32)
+
+        # gram -> (trigram counts ascending, name ids in the same order)
+        self.trigram_index: Dict[str, Tuple[List[int], np.ndarray]] = {}
+        for gram, name_ids in postings.items():
+            name_ids.sort(key=lambda name_id: lengths[name_id])
+            self.trigram_index[gram] = ([lengths[i] for i in name_ids], np.array(name_ids, dtype=np.int32))
+
+    def fuzzy_matches(self, query: Set[str], threshold: float) -> List[Tuple[int, float]]:
+        """Returns (name id, Dice score) for every list name scoring >= threshold against query."""
+        size = len(query)
+        # Dice >= t is only possible for t/(2-t) * |A| <= |B| <= (2-t)/t * |A|
+        min_len = math.ceil(threshold * size / (2 - threshold) - 1e-9)
+        max_len = math.floor((2 - threshold) * size / threshold + 1e-9) if threshold > 0 else size * size
+
+        slices = []
+        for gram in query:
+            posting = self.trigram_index.get(gram)
+            if posting is None:
+                continue
+            lengths, name_ids = posting
+            lo = bisect.bisect_left(lengths, min_len)
+            hi = bisect.bisect_right(lengths, max_len)
+            if lo < hi:
+                slices.append(name_ids[lo:hi])
+        if not slices:
+            return []
+
+        shared = np.bincount(np.concatenate(slices), minlength=len(self.name_lengths))
+        totals = size + self.name_lengths
+        matched = np.flatnonzero(2 * shared >= threshold * totals)
+        dice = 2.0 * shared[matched] / totals[matched]
+        return list(zip(matched.tolist(), dice.tolist()))
+
+    def lookup(self, name: str, threshold: float) -> Dict[int, tuple]:
+        """Returns {entry_id: (score, matched list name)} for entries scoring >= threshold."""
+        normalized = normalize_name(name)
+        if not normalized:
+            return {}
+
+        scores: Dict[int, float] = {}
+
+        # Exact normalized match, or the same tokens in a different order ("Petrov Viktor")
+        for name_id in (*self.exact.get(normalized, ()), *self.token_sets.get(frozenset(normalized.split()), ())):
+            scores[name_id] = 1.0
+
+        # Fuzzy trigram Dice coefficient
+        for name_id, dice in self.fuzzy_matches(trigrams(normalized), threshold):
+            scores.setdefault(name_id, dice)
+
+        matches: Dict[int, tuple] = {}
+        for name_id, score in scores.items():
+            entry_id = self.name_owner[name_id]
+            if entry_id not in matches or score > matches[entry_id][0]:
+                matches[entry_id] = (score, self.name_text[name_id])
+        return matches
+
+
+class SanctionsScreener:
+    def __init__(self, list_path: str = DEFAULT_LIST_PATH, threshold: float = 0.8,
+                 reload_interval: float = 5.0):
+        """
+        Screens entity names against a local sanctions list.
+
+        Args:
+            list_path (str): Path to a .csv or .xml sanctions list
+            threshold (float): Minimum similarity (0-1) reported as a hit
+            reload_interval (float): Seconds between checks for a modified list file
+        """
+        self.list_path = list_path
+        self.threshold = threshold
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._index = SanctionsIndex([])
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self.load()
+
+    def load(self) -> None:
+        """
+        (Re)builds the index from list_path; the previous index stays live until the swap.
+
+        A list that cannot be read or parsed (bad encoding, malformed rows) keeps the previous
+        index in service and is not retried until the file changes again.
+        """
+        try:
+            mtime = os.path.getmtime(self.list_path)
+        except OSError as e:
+            logger.error(f"Failed to load sanctions list {self.list_path}: {str(e)}")
+            return
+
+        try:
+            if self.list_path.lower().endswith('.xml'):
+                entries = read_sanctions_xml(self.list_path)
+            else:
+                entries = read_sanctions_csv(self.list_path)
+            index = SanctionsIndex(entries)
+        except (OSError, csv.Error, ET.ParseError, ValueError, KeyError, TypeError) as e:
+            # UnicodeDecodeError is a ValueError, e.g. a Latin-1 export read as UTF-8
+            logger.error(f"Failed to load sanctions list {self.list_path}, keeping the previous list: {str(e)}")
+            with self._lock:
+                self._mtime = mtime
+            return
+
+        with self._lock:
+            self._index = index
+            self._mtime = mtime
+        logger.info(f"Loaded {len(entries)} sanctions entries from {self.list_path}")
+
+    def reload_if_changed(self) -> bool:
+        """Reloads the list when its modification time changed; returns True if reloaded."""
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return False
+        self._last_check = now
+
+        try:
+            mtime = os.path.getmtime(self.list_path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+
+        self.load()
+        return True
+
+    def match_name(self, name: Optional[str]) -> List[Dict]:
+        """
+        Matches a single name against the sanctions list.
+
+        Args:
+            name (Optional[str]): Entity name to screen
+
+        Returns:
+            List[Dict]: Hits sorted by descending score
+        """
+        self.reload_if_changed()
+        index = self._index
+
+        hits = [
+            {
+                "Entity Name": name,
+                "Matched Name": matched_name,
+                "List Entry": index.entries[entry_id]["uid"],
+                "Program": index.entries[entry_id]["program"],
+                "Score": round(score, 4)
+            }
+            for entry_id, (score, matched_name) in index.lookup(name, self.threshold).items()
+        ]
+        return sorted(hits, key=lambda hit: -hit["Score"])
+
+    def screen_transactions(self, transactions: List[Dict]) -> List[Dict]:
+        """Adds 'Sanctions Hits' for Sender, Receiver and Proper Noun Entity names in place."""
+        self.reload_if_changed()
+
+        for txn in transactions:
+            names = [
+                (txn.get("Sender") or {}).get("Name"),
+                (txn.get("Receiver") or {}).get("Name"),
+                *[entity.get("Entity Name") for entity in txn.get("Proper Noun Entities") or []]
+            ]
+            hits = []
+            seen = set()
+            for name in names:
+                if not name or name in seen:
+                    continue
+                seen.add(name)
+                hits.extend(self.match_name(name))
+            txn["Sanctions Hits"] = hits
+
+        return transactions
+
+
+def synthetic_sanctions_entries(entry_count: int = SDN_ENTRY_COUNT, seed: int = 0) -> List[Dict]:
+    """Generates syllable-based person and entity names with 0-3 aliases each, shaped like the SDN list."""
+    rng = random.Random(seed)
+
+    def word() -> str:
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+
+    entries = []
+    for uid in range(entry_count):
+        if rng.random() < 0.5:
+            make_name = lambda: f"{word()} {word()}"
+        else:
+            make_name = lambda: f"{word()} {word()} {rng.choice(ENTITY_WORDS)} {rng.choice(['LLC', 'Ltd', 'FZE', ''])}".strip()
+        entries.append({
+            "uid": str(uid),
+            "name": make_name(),
+            "type": "",
+            "program": "SYNTHETIC",
+            "aliases": [make_name() for _ in range(rng.randint(0, 3))]
+        })
+    return entries
+
+
+def benchmark_screening(entry_count: int = SDN_ENTRY_COUNT, queries: int = 2000,
+                        threshold: float = 0.8, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Times SanctionsIndex.lookup at SDN scale for exact hits, one-typo hits and misses.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Mean and p99 microseconds per name for each query kind
+    """
+    rng = random.Random(seed + 1)
+    entries = synthetic_sanctions_entries(entry_count, seed)
+    start = time.perf_counter()
+    index = SanctionsIndex(entries)
+    logger.info(f"Indexed {len(index.name_text)} names from {entry_count} entries "
+                f"in {time.perf_counter() - start:.2f}s")
+
+    def typo(name: str) -> str:
+        position = rng.randrange(len(name))
+        return name[:position] + rng.choice('aeiou') + name[position + 1:]
+
+    listed = [rng.choice(index.name_text) for _ in range(queries)]
+    unlisted = [name['name'] for name in synthetic_sanctions_entries(queries, seed + 2)]
+    results = {}
+    for kind, names in (("exact", listed), ("typo", [typo(n) for n in listed]), ("miss", unlisted)):
+        timings = []
+        for name in names:
+            start = time.perf_counter()
+            index.lookup(name, threshold)
+            timings.append((time.perf_counter() - start) * 1e6)
+        timings.sort()
+        results[kind] = {
+            "mean_us": round(sum(timings) / len(timings), 1),
+            "p99_us": round(timings[int(0.99 * (len(timings) - 1))], 1)
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Screen example names or benchmark the sanctions index.")
+    parser.add_argument("--benchmark", action='store_true', help="Benchmark lookups on a synthetic SDN-sized list")
+    parser.add_argument("--entries", type=int, default=SDN_ENTRY_COUNT, help="Synthetic list size for --benchmark")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+        print(benchmark_screening(args.entries))
+    else:
+        screener = SanctionsScreener()
+        for example in ["Mr. Viktor Petrov", "Golden Sands Trading EZE", "quantum holdings limited", "BlackRock"]:
+            print(f"{example}: {screener.match_name(example)}")
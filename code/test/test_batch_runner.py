@@ -0,0 +1,160 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import batchRunner
+from batchRunner import BatchRunner, expand_inputs, main
+from sanctionsScreening import SanctionsScreener
+
+def fake_unstructured_record(data, parsed_data):
+    # Skip spaCy NER; the runner only cares about record flow here
+    return {
+        "Transaction ID": parsed_data.get("Transaction ID", ""),
+        "Amount": parsed_data.get("Amount", ""),
+        "Sender": parsed_data["Sender"],
+        "Receiver": parsed_data["Receiver"],
+        "Proper Noun Entities": []
+    }
+
+def make_transaction(i):
+    return (f'Transaction ID: TXN-{i:04d}\n'
+            f'Sender:\n• Name: "Sender {i}"\n'
+            f'Receiver:\n• Name: "Viktor Petrov"\n'
+            f'Amount: $1,000.00 (USD)\n')
+
+@patch('batchRunner.build_unstructured_record', side_effect=fake_unstructured_record)
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.input_path = os.path.join(self.tmp_dir, "transactions.txt")
+        with open(self.input_path, 'w', encoding='utf-8') as f:
+            f.write("\n---\n".join(make_transaction(i) for i in range(25)))
+        self.list_path = os.path.join(self.tmp_dir, "sanctions.csv")
+        with open(self.list_path, 'w', encoding='utf-8') as f:
+            f.write("uid,name,type,program,aliases\n09876,Viktor Petrov,Individual,SDGT,\n")
+        self.output_path = os.path.join(self.tmp_dir, "out.jsonl")
+        self.checkpoint_path = self.output_path + ".ckpt"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def make_runner(self, **kwargs):
+        return BatchRunner([self.input_path], self.output_path, checkpoint_path=self.checkpoint_path,
+                           queue_size=2, batch_size=4, screener=SanctionsScreener(self.list_path), **kwargs)
+
+    def read_ids(self):
+        with open(self.output_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line)["Transaction ID"] for line in f]
+
+    def test_expand_inputs(self, _):
+        notes_path = os.path.join(self.tmp_dir, "notes.md")
+        open(notes_path, 'w').close()
+        patterns = [os.path.join(self.tmp_dir, "*.txt"), self.input_path, notes_path, "missing.csv"]
+        self.assertEqual(expand_inputs(patterns), [self.input_path])
+
+    def test_streams_all_records_in_order(self, _):
+        self.assertEqual(self.make_runner().run(), 25)
+        self.assertEqual(self.read_ids(), [f"TXN-{i:04d}" for i in range(25)])
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+        with open(self.output_path, 'r', encoding='utf-8') as f:
+            record = json.loads(f.readline())
+        self.assertEqual(record["Sanctions Hits"][0]["List Entry"], "09876")
+        self.assertIn("Risk Score", record)
+
+    def test_resume_after_crash(self, _):
+        original = batchRunner.iter_parsed_records
+
+        def crash_midway(path, skip=0, chunk_size=1000):
+            for index, parsed in original(path, skip, chunk_size):
+                if index == 13:
+                    raise IOError("disk went away")
+                yield index, parsed
+
+        with patch('batchRunner.iter_parsed_records', side_effect=crash_midway):
+            with self.assertRaises(IOError):
+                self.make_runner().run()
+        self.assertTrue(os.path.exists(self.checkpoint_path))
+        self.assertLessEqual(len(self.read_ids()), 13)
+
+        self.make_runner().run()
+        self.assertEqual(self.read_ids(), [f"TXN-{i:04d}" for i in range(25)])
+
+    def test_categorize_stage(self, build_record):
+        def with_sender_entity(data, parsed_data):
+            record = fake_unstructured_record(data, parsed_data)
+            record["Proper Noun Entities"] = [{"Entity Name": record["Sender"]["Name"], "Entity Type": "Organization"}]
+            return record
+
+        class FakeCategorizer:
+            def __init__(self):
+                self.lookups = []
+
+            def get_matching_categories(self, name):
+                self.lookups.append(name)
+                return ["Shell Companies"] if name == "Sender 3" else []
+
+        build_record.side_effect = with_sender_entity
+        categorizer = FakeCategorizer()
+        self.assertEqual(self.make_runner(categorizer=categorizer).run(), 25)
+        self.assertEqual(self.read_ids(), [f"TXN-{i:04d}" for i in range(25)])
+        self.assertEqual(sorted(categorizer.lookups), sorted(f"Sender {i}" for i in range(25)))
+
+        with open(self.output_path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[3]["Entity Categories"], {"Sender 3": ["Shell Companies"]})
+        self.assertEqual(records[4]["Entity Categories"], {})
+
+    def test_bad_files_are_skipped(self, _):
+        # A watchlist matched by the same glob as the transaction files, and a file in the wrong encoding
+        watchlist_path = os.path.join(self.tmp_dir, "a_watchlist.csv")
+        shutil.copy(self.list_path, watchlist_path)
+        latin1_path = os.path.join(self.tmp_dir, "b_latin1.txt")
+        with open(latin1_path, 'wb') as f:
+            f.write(make_transaction(99).replace("Sender 99", "José").encode('cp1252'))
+        second_path = os.path.join(self.tmp_dir, "z_more.txt")
+        with open(second_path, 'w', encoding='utf-8') as f:
+            f.write(make_transaction(25))
+
+        inputs = [watchlist_path, latin1_path, self.input_path, second_path]
+        runner = BatchRunner(inputs, self.output_path, checkpoint_path=self.checkpoint_path,
+                             batch_size=4, screener=SanctionsScreener(self.list_path))
+        self.assertEqual(runner.run(), 26)
+        self.assertEqual(self.read_ids(), [f"TXN-{i:04d}" for i in range(26)])
+
+    def test_csv_output(self, _):
+        code = main([self.input_path, "-o", os.path.join(self.tmp_dir, "out.csv"), "-f", "csv",
+                     "--sanctions-list", self.list_path, "--no-checkpoint"])
+        self.assertEqual(code, 0)
+        with open(os.path.join(self.tmp_dir, "out.csv"), 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0].split(',')[:2], ["Source File", "Transaction ID"])
+        self.assertEqual(len(lines), 26)
+
+class TestStructuredOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_empty_cells_are_written_as_null(self):
+        input_path = os.path.join(self.tmp_dir, "transactions.csv")
+        with open(input_path, 'w', encoding='utf-8') as f:
+            f.write("Transaction,Payer Name,Receiver Name,Transaction Details,Amount,Receiver Country\n"
+                    "TXN001,Acme Corp,Globex Ltd,Invoice 42,\"$1,000\",\n")
+        output_path = os.path.join(self.tmp_dir, "out.jsonl")
+        self.assertEqual(main([input_path, "-o", output_path, "--no-checkpoint"]), 0)
+
+        def reject(constant):
+            raise ValueError(f"Invalid JSON constant: {constant}")
+
+        with open(output_path, 'r', encoding='utf-8') as f:
+            record = json.loads(f.readline(), parse_constant=reject)
+        self.assertIsNone(record["Proper Noun Entities"][2]["Entity Name"])
+        self.assertIsNone(record["Date"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import threading
+import unittest
+from categorizationPipeline import CategorizationPipeline
+
+class FakeWikipediaCategorizer:
+    """Stands in for FinancialEntityCategorizer; an optional hook runs inside each lookup."""
+
+    def __init__(self, on_lookup=None):
+        self.on_lookup = on_lookup
+        self.lookups = []
+        self.completed = 0
+        self.lock = threading.Lock()
+
+    def get_matching_categories(self, entity_name):
+        if self.on_lookup:
+            self.on_lookup(entity_name)
+        with self.lock:
+            self.lookups.append(entity_name)
+            self.completed += 1
+        if entity_name == "Broken Corp":
+            raise Exception("Wikipedia API Error")
+        return ["Shell Companies"] if "Holdings" in entity_name else []
+
+def make_record(index):
+    return {
+        "Transaction ID": f"TXN-{index}",
+        "Proper Noun Entities": [
+            {"Entity Name": f"Org {index} Holdings", "Entity Type": "Organization"},
+            {"Entity Name": "Deutsche Bank", "Entity Type": "Bank"},
+            {"Entity Name": "Viktor Petrov", "Entity Type": "Person"}
+        ]
+    }
+
+class TestCategorizationPipeline(unittest.TestCase):
+    def test_categories_attached_in_order(self):
+        categorizer = FakeWikipediaCategorizer()
+        records = list(CategorizationPipeline(categorizer).stream(make_record(i) for i in range(5)))
+
+        self.assertEqual([r["Transaction ID"] for r in records], [f"TXN-{i}" for i in range(5)])
+        self.assertEqual(records[2]["Entity Categories"], {"Org 2 Holdings": ["Shell Companies"]})
+        # Shared entities are looked up once, persons never
+        self.assertEqual(categorizer.lookups.count("Deutsche Bank"), 1)
+        self.assertNotIn("Viktor Petrov", categorizer.lookups)
+
+    def test_lookups_overlap_with_ner(self):
+        next_record_requested = threading.Event()
+        overlapped = []
+
+        def on_lookup(name):
+            # The first lookup only finishes once NER has been asked for the following record
+            if name == "Org 0 Holdings":
+                overlapped.append(next_record_requested.wait(timeout=5))
+
+        def ner_stage():
+            for index in range(3):
+                if index == 1:
+                    next_record_requested.set()
+                yield make_record(index)
+
+        pipeline = CategorizationPipeline(FakeWikipediaCategorizer(on_lookup), lookup_workers=1)
+        records = list(pipeline.stream(ner_stage()))
+        self.assertEqual(overlapped, [True])
+        self.assertEqual(len(records), 3)
+
+    def test_backpressure_pauses_ner(self):
+        release = threading.Event()
+        categorizer = FakeWikipediaCategorizer(lambda name: release.wait(timeout=5))
+        completed_when_requested = []
+
+        def ner_stage():
+            for index in range(20):
+                completed_when_requested.append(categorizer.completed)
+                if index == 2:
+                    release.set()
+                yield {"Proper Noun Entities": [{"Entity Name": f"Org {index}", "Entity Type": "Organization"}]}
+
+        pipeline = CategorizationPipeline(categorizer, queue_size=1, lookup_workers=1)
+        self.assertEqual(len(list(pipeline.stream(ner_stage()))), 20)
+        # Record k is only pulled once names 0..k-1 are queued: one in flight, one waiting, the rest done
+        for index, completed in enumerate(completed_when_requested):
+            self.assertGreaterEqual(completed, index - 2)
+
+    def test_lookup_errors_are_isolated(self):
+        records = list(CategorizationPipeline(FakeWikipediaCategorizer()).stream(
+            {"Proper Noun Entities": [{"Entity Name": name, "Entity Type": "Organization"}]}
+            for name in ["Broken Corp", "Quantum Holdings"]
+        ))
+        self.assertEqual(records[0]["Entity Categories"], {})
+        self.assertEqual(records[1]["Entity Categories"], {"Quantum Holdings": ["Shell Companies"]})
+
+    def test_cache_is_bounded(self):
+        def records(names):
+            return ({"Proper Noun Entities": [{"Entity Name": name, "Entity Type": "Organization"}]}
+                    for name in names)
+
+        categorizer = FakeWikipediaCategorizer()
+        pipeline = CategorizationPipeline(categorizer, cache_size=2)
+        list(pipeline.stream(records(["A Holdings", "B Corp", "C Corp"])))
+        self.assertEqual(list(pipeline._categories), ["B Corp", "C Corp"])
+
+        later = list(pipeline.stream(records(["A Holdings", "C Corp"])))
+        self.assertEqual(later[0]["Entity Categories"], {"A Holdings": ["Shell Companies"]})
+        self.assertLessEqual(len(pipeline._categories), 2)
+        # The evicted name is simply looked up again; the cached one is not
+        self.assertEqual(categorizer.lookups.count("A Holdings"), 2)
+        self.assertEqual(categorizer.lookups.count("C Corp"), 1)
+
+    def test_records_with_more_entities_than_the_cache(self):
+        records = list(CategorizationPipeline(FakeWikipediaCategorizer(), cache_size=1).stream(
+            make_record(i) for i in range(5)
+        ))
+        self.assertEqual(records[4]["Entity Categories"], {"Org 4 Holdings": ["Shell Companies"]})
+        with self.assertRaises(ValueError):
+            CategorizationPipeline(FakeWikipediaCategorizer(), cache_size=0)
+
+    def test_markers_pass_through(self):
+        items = [("a.csv", 0, make_record(0)), ("file_end", "a.csv", 1), ("b.csv", 0, None)]
+        streamed = list(CategorizationPipeline(FakeWikipediaCategorizer()).stream(
+            items, get_record=lambda item: None if item[0] == "file_end" else item[2]
+        ))
+        self.assertEqual(streamed, items)
+        self.assertIn("Entity Categories", streamed[0][2])
+
+if __name__ == '__main__':
+    unittest.main()
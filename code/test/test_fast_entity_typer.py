@@ -0,0 +1,69 @@
+import unittest
+from fastEntityTyper import FastPathStats, fast_entity_type, fast_path_stats, type_entity
+
+class TestFastEntityTyper(unittest.TestCase):
+    def setUp(self):
+        fast_path_stats.reset()
+
+    def test_gazetteer_types(self):
+        self.assertEqual(fast_entity_type("Mr. Viktor Petrov"), "Person")
+        self.assertEqual(fast_entity_type("Deutsche Bank Frankfurt"), "Bank")
+        self.assertEqual(fast_entity_type("Emirates NBD"), "Bank")
+        self.assertEqual(fast_entity_type("Quantum Holdings Ltd"), "Organization")
+        self.assertEqual(fast_entity_type("ABC GmbH"), "Organization")
+        self.assertEqual(fast_entity_type("Dubai, UAE"), "Jurisdiction")
+        self.assertEqual(fast_entity_type("British Virgin Islands"), "Jurisdiction")
+        self.assertEqual(fast_entity_type("Nestle S.A."), "Organization")
+        self.assertEqual(fast_entity_type("Sir Kensington Holdings"), "Organization")
+        # Names as the structured processor expands them
+        self.assertEqual(fast_entity_type("abc gesellschaft mit beschränkter haftung"), "Organization")
+        self.assertEqual(fast_entity_type("oceanic holdings limited liability company"), "Organization")
+
+    def test_ambiguous_names_are_left_to_ner(self):
+        self.assertIsNone(fast_entity_type("Maria Gonzalez"))
+        self.assertIsNone(fast_entity_type("CCMI"))
+        self.assertIsNone(fast_entity_type("Cocoa Traders"))  # no substring matches on "co"
+        self.assertIsNone(fast_entity_type("Mr"))
+        # Short forms and generic words only count as a trailing legal form
+        self.assertIsNone(fast_entity_type("Maria Sa"))
+        self.assertIsNone(fast_entity_type("Group Treasury"))
+        self.assertIsNone(fast_entity_type("Lord Abbett"))
+        self.assertIsNone(fast_entity_type(None))
+
+    def test_type_entity_only_calls_ner_when_needed(self):
+        ner_calls = []
+
+        def ner(name):
+            ner_calls.append(name)
+            return "Person"
+
+        self.assertEqual(type_entity("Alpha Investments Inc", ner), "Organization")
+        self.assertEqual(type_entity("Maria Gonzalez", ner), "Person")
+        self.assertEqual(type_entity("CCMI", ner, rules=lambda name: "Organization"), "Organization")
+        self.assertEqual(ner_calls, ["Maria Gonzalez"])
+
+        report = fast_path_stats.report()
+        self.assertEqual(report["names"], 3)
+        self.assertEqual(report["rule_names"], 1)
+        self.assertEqual(report["gazetteer_names"], 1)
+        self.assertEqual(report["ner_names"], 1)
+        # Rule hits never went to NER, so only gazetteer and NER names count towards coverage
+        self.assertEqual(report["fast_path_fraction"], 0.5)
+
+    def test_report_latency_saved(self):
+        stats = FastPathStats()
+        stats.record("rule")
+        stats.record("gazetteer", gazetteer_seconds=0.00001)
+        stats.record("gazetteer", gazetteer_seconds=0.00001)
+        stats.record("ner", gazetteer_seconds=0.00001, ner_seconds=0.005)
+        report = stats.report()
+        self.assertEqual(report["ner_ms_per_name"], 5.0)
+        self.assertEqual(report["gazetteer_ms_per_name"], 0.01)
+        # Two NER calls avoided, less three gazetteer checks
+        self.assertAlmostEqual(report["estimated_ms_saved"], 9.97)
+        self.assertEqual(FastPathStats().report()["fast_path_fraction"], 0.0)
+        with self.assertRaises(ValueError):
+            stats.record("cache")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import inputProcessor
+
+class TestUploadEndpoint(unittest.TestCase):
+    def setUp(self):
+        # The endpoint writes to uploads/ and data/ relative to the working directory
+        self.cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.client = inputProcessor.app.test_client()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def upload(self, name="transactions.csv"):
+        return self.client.post('/upload', data={"file": (io.BytesIO(b"Transaction ID\nTXN001\n"), name)},
+                                content_type='multipart/form-data')
+
+    def test_upload_removed_after_processing(self):
+        with mock.patch.object(inputProcessor, 'process_transactions', return_value=[{"Transaction ID": "TXN001"}]):
+            response = self.upload()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(os.listdir('uploads'), [])
+        self.assertEqual(os.listdir('data'), ["processed_transactions.json"])
+
+    def test_upload_removed_when_processing_fails(self):
+        with mock.patch.object(inputProcessor, 'process_transactions', side_effect=RuntimeError("boom")):
+            response = self.upload()
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(os.listdir('uploads'), [])
+
+    def test_tmp_output_removed_when_write_fails(self):
+        unserializable = [{"Transaction ID": "TXN001", "Amount": object()}]
+        with mock.patch.object(inputProcessor, 'process_transactions', return_value=unserializable):
+            response = self.upload()
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(os.listdir('uploads'), [])
+        self.assertEqual(os.listdir('data'), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+from riskScoring import (
+    EXACT_HIT_RISK_FLOOR,
+    FEATURE_NAMES,
+    extract_features,
+    parse_amount,
+    score_transactions,
+)
+
+class TestRiskScoring(unittest.TestCase):
+    def setUp(self):
+        self.low_risk = {
+            "Transaction ID": "TXN003",
+            "Date": "2023-09-20",
+            "Amount": "15000",
+            "Transaction Type": "Wire Transfer",
+            "Reference": "INV-001",
+            "Sender": {"Name": "xyz limited", "Jurisdiction": "Berlin, Germany"},
+            "Receiver": {"Name": "abc gesellschaft", "Jurisdiction": "Munich, Germany"},
+            "Transaction Details": {"Notes": ["Purchase of office supplies"]},
+            "Proper Noun Entities": [
+                {"Entity Name": "xyz limited", "Entity Type": "Organization"},
+                {"Entity Name": "Germany", "Entity Type": "Jurisdiction"}
+            ]
+        }
+        self.high_risk = {
+            "Transaction ID": "TXN-2023-7C2D",
+            "Amount": "$950,000.00 (USD)",
+            "Sender": {"Name": "Quantum Holdings Ltd", "Jurisdiction": "British Virgin Islands"},
+            "Receiver": {"Name": "Golden Sands Trading EZE", "Jurisdiction": "Dubai, UAE"},
+            "Transaction Details": {
+                "Notes": ["Approver: Mr. Viktor Petrov (Linked to OFAC SDN List entry 09876, 2022)."]
+            },
+            "Proper Noun Entities": [
+                {"Entity Name": "Quantum Holdings Ltd", "Entity Type": "Organization"},
+                {"Entity Name": "British Virgin Islands", "Entity Type": "Jurisdiction"},
+                {"Entity Name": "Viktor Petrov", "Entity Type": "Person"}
+            ]
+        }
+
+    def test_parse_amount(self):
+        self.assertEqual(parse_amount("500000"), 500000.0)
+        self.assertEqual(parse_amount("950,000.00"), 950000.0)
+        self.assertEqual(parse_amount("$1,000,000.00 (USD)"), 1000000.0)
+        self.assertEqual(parse_amount(None), 0.0)
+        self.assertEqual(parse_amount("N/A"), 0.0)
+
+    def test_feature_matrix_shape(self):
+        features = extract_features([self.low_risk, self.high_risk, {}])
+        self.assertEqual(features.shape, (3, len(FEATURE_NAMES)))
+        self.assertTrue(np.all(features[2] == 0))
+
+    def test_high_risk_scores_above_low_risk(self):
+        scored = score_transactions([self.low_risk, self.high_risk])
+        self.assertLess(scored[0]["Risk Score"], 0.3)
+        self.assertGreater(scored[1]["Risk Score"], scored[0]["Risk Score"])
+
+    def test_confidence_reflects_evidence(self):
+        screened = dict(self.low_risk, **{"Sanctions Hits": []})
+        fuzzy_hit = dict(self.low_risk, **{"Sanctions Hits": [{"Score": 0.9}]})
+        untyped = dict(screened, **{"Proper Noun Entities": [{"Entity Name": "xyz", "Entity Type": "Unknown"}]})
+        scored = score_transactions([screened, dict(self.low_risk), fuzzy_hit, untyped, {}])
+
+        confidences = [txn["Confidence Score"] for txn in scored]
+        self.assertEqual(confidences[0], 1.0)
+        self.assertAlmostEqual(confidences[1], 0.7)  # never screened
+        self.assertAlmostEqual(confidences[2], 0.85)  # ambiguous fuzzy hit
+        self.assertAlmostEqual(confidences[3], 0.8)
+        self.assertEqual(confidences[4], 0.0)
+
+    def test_categorizer_flags_raise_score(self):
+        baseline = score_transactions([dict(self.low_risk)])[0]["Risk Score"]
+        flagged = score_transactions(
+            [dict(self.low_risk)],
+            entity_categories={"abc gesellschaft": ["Shell Companies"]}
+        )[0]["Risk Score"]
+        self.assertGreater(flagged, baseline)
+
+    def test_sanctions_hits_raise_score(self):
+        baseline = score_transactions([dict(self.low_risk)])[0]["Risk Score"]
+        screened = dict(self.low_risk, **{"Sanctions Hits": [{"Score": 0.95}]})
+        self.assertGreater(score_transactions([screened])[0]["Risk Score"], baseline)
+
+    def test_exact_sanctions_hit_is_high_risk(self):
+        # TXN001 in the structured sample: a $500k transfer whose receiver is on the list
+        exact_hit = dict(self.low_risk, **{"Amount": "500000", "Sanctions Hits": [{"Score": 1.0}]})
+        fuzzy_hit = dict(self.low_risk, **{"Amount": "500000", "Sanctions Hits": [{"Score": 0.85}]})
+        scored = score_transactions([exact_hit, fuzzy_hit])
+        self.assertGreaterEqual(scored[0]["Risk Score"], EXACT_HIT_RISK_FLOOR)
+        self.assertGreaterEqual(scored[0]["Risk Score"], 0.75)
+        self.assertLess(scored[1]["Risk Score"], EXACT_HIT_RISK_FLOOR)
+
+    def test_empty_batch(self):
+        self.assertEqual(score_transactions([]), [])
+
+if __name__ == '__main__':
+    unittest.main()
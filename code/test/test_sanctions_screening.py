@@ -0,0 +1,142 @@
+import os
+import shutil
+import tempfile
+import unittest
+from sanctionsScreening import (
+    SanctionsIndex,
+    SanctionsScreener,
+    normalize_name,
+    synthetic_sanctions_entries,
+    trigrams,
+)
+
+SANCTIONS_CSV = """uid,name,type,program,aliases
+09876,Viktor Petrov,Individual,RUSSIA-EO14024,Viktor A. Petrov
+11380,Golden Sands Trading FZE,Entity,IRAN,
+20001,Oceanic Holdings LLC,Entity,CYBER2,
+20002,ABC GmbH,Entity,SDGT,
+"""
+
+SANCTIONS_XML = """<?xml version="1.0"?>
+<sdnList xmlns="http://tempuri.org/sdnList.xsd">
+  <sdnEntry>
+    <uid>20001</uid>
+    <lastName>Oceanic Holdings LLC</lastName>
+    <sdnType>Entity</sdnType>
+    <programList><program>CYBER2</program></programList>
+    <akaList><aka><lastName>Oceanic Group</lastName></aka></akaList>
+  </sdnEntry>
+</sdnList>
+"""
+
+class TestSanctionsScreener(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.tmp_dir, "sanctions.csv")
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write(SANCTIONS_CSV)
+        self.screener = SanctionsScreener(self.csv_path, reload_interval=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("Mr. Viktor Petrov"), "viktor petrov")
+        self.assertEqual(normalize_name("Quantum Holdings Ltd"), "quantum holdings")
+        self.assertEqual(normalize_name(None), "")
+        # Only legal forms are dropped, never ordinary words that happen to appear in them
+        self.assertEqual(normalize_name("Public Bank Berhad"), "public bank berhad")
+
+    def test_structured_path_names_match(self):
+        # processStructured expands legal forms via ABBREVIATION_MAP before screening
+        for expanded, uid in [
+            ("oceanic holdings limited liability company", "20001"),
+            ("abc gesellschaft mit beschränkter haftung", "20002"),
+        ]:
+            hits = self.screener.match_name(expanded)
+            self.assertEqual(hits[0]["List Entry"], uid)
+            self.assertEqual(hits[0]["Score"], 1.0)
+
+    def test_exact_and_reordered_match(self):
+        hits = self.screener.match_name("Mr. Viktor Petrov")
+        self.assertEqual(hits[0]["List Entry"], "09876")
+        self.assertEqual(hits[0]["Score"], 1.0)
+        self.assertEqual(self.screener.match_name("PETROV, Viktor")[0]["Score"], 1.0)
+
+    def test_fuzzy_match(self):
+        hits = self.screener.match_name("Golden Sands Trading EZE")
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(hits[0]["Program"], "IRAN")
+        self.assertLess(hits[0]["Score"], 1.0)
+
+    def test_filtered_fuzzy_matches_equal_brute_force(self):
+        index = SanctionsIndex(synthetic_sanctions_entries(300, seed=3))
+        listed = [trigrams(normalize_name(name)) for name in index.name_text]
+        for query_name in index.name_text[:40] + ["Karimo Ranelo Trading", "Vimi Mousmous"]:
+            query = trigrams(normalize_name(query_name))
+            expected = {
+                name_id for name_id, grams in enumerate(listed)
+                if 2.0 * len(query & grams) / (len(query) + len(grams)) >= 0.8
+            }
+            self.assertEqual({name_id for name_id, _ in index.fuzzy_matches(query, 0.8)}, expected)
+
+    def test_no_match(self):
+        self.assertEqual(self.screener.match_name("BlackRock"), [])
+        self.assertEqual(self.screener.match_name(""), [])
+
+    def test_screen_transactions(self):
+        transactions = [{
+            "Sender": {"Name": "Quantum Holdings Ltd"},
+            "Receiver": {"Name": "Golden Sands Trading EZE"},
+            "Proper Noun Entities": [
+                {"Entity Name": "Viktor Petrov", "Entity Type": "Person"},
+                {"Entity Name": "Golden Sands Trading EZE", "Entity Type": "Organization"}
+            ]
+        }]
+        hits = self.screener.screen_transactions(transactions)[0]["Sanctions Hits"]
+        self.assertEqual(sorted(hit["List Entry"] for hit in hits), ["09876", "11380"])
+
+    def test_screen_structured_transactions(self):
+        transactions = [{
+            "Sender": {"Name": "oceanic holdings limited liability company"},
+            "Receiver": {"Name": "public limited company"},
+            "Proper Noun Entities": []
+        }]
+        hits = self.screener.screen_transactions(transactions)[0]["Sanctions Hits"]
+        self.assertEqual([hit["List Entry"] for hit in hits], ["20001"])
+
+    def test_hot_reload(self):
+        self.assertEqual(self.screener.match_name("Acme Corp"), [])
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write("30001,Acme Corporation,Entity,SDGT,\n")
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(self.screener.match_name("Acme Corp")[0]["List Entry"], "30001")
+
+    def test_bad_reload_keeps_previous_index(self):
+        with open(self.csv_path, 'wb') as f:
+            f.write("uid,name,type,program,aliases\n40001,José Ortega,Individual,SDGT,\n".encode('latin-1'))
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, (stat.st_atime, stat.st_mtime + 10))
+
+        hits = self.screener.match_name("Viktor Petrov")
+        self.assertEqual(hits[0]["List Entry"], "09876")
+        transactions = self.screener.screen_transactions([{"Sender": {"Name": "Viktor Petrov"}}])
+        self.assertEqual(transactions[0]["Sanctions Hits"][0]["List Entry"], "09876")
+
+    def test_unreadable_initial_list_starts_empty(self):
+        with open(self.csv_path, 'wb') as f:
+            f.write(b"uid,name\n1,Jos\xe9\n")
+        self.assertEqual(SanctionsScreener(self.csv_path).match_name("Viktor Petrov"), [])
+
+    def test_xml_list(self):
+        xml_path = os.path.join(self.tmp_dir, "sdn.xml")
+        with open(xml_path, 'w', encoding='utf-8') as f:
+            f.write(SANCTIONS_XML)
+        screener = SanctionsScreener(xml_path)
+        hits = screener.match_name("Oceanic Group")
+        self.assertEqual(hits[0]["List Entry"], "20001")
+        self.assertEqual(hits[0]["Program"], "CYBER2")
+
+if __name__ == '__main__':
+    unittest.main()